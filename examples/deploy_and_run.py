@@ -6,9 +6,15 @@ Reads WALLET_PRIVATE_KEY from environment or .env.
 """
 
 import os
+import time
 import asyncio
 from dotenv import load_dotenv
-from nosana_deployments import create_nosana_deployment_client, upload_job_to_ipfs
+from nosana_deployments import (
+    create_nosana_deployment_client,
+    upload_job_to_ipfs,
+    LAMPORTS_PER_SOL,
+    NOS_UNITS_PER_NOS,
+)
 import requests
 
 RPC_URL = "https://api.mainnet-beta.solana.com"
@@ -48,6 +54,19 @@ JOB_DEF = {
 }
 
 
+async def wait_until(predicate, timeout: float = 60.0, delay: float = 1.0, max_delay: float = 5.0) -> bool:
+    """Await predicate() with exponential backoff until it is true; False on timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if await predicate():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, max_delay)
+
+
 async def main() -> None:
     print("🚀 Create & Run Deployment")
     print("=" * 40)
@@ -83,11 +102,17 @@ async def main() -> None:
         if r.status_code==200 and r.json().get("result",{}).get("value"):
             return int(r.json()["result"]["value"]["amount"]) 
         return 0
-    sol_lamports = get_sol(client.auth.user_id)
-    nos_units = get_nos_units(client.auth.user_id)
-    if sol_lamports < 12_000_000 or nos_units < 3_000_000:
-        need_sol = max(0, 12_000_000 - sol_lamports)/1e9
-        need_nos = max(0, 3_000_000 - nos_units)/1e6
+    # The two lookups are independent - run them concurrently
+    sol_lamports, nos_units = await asyncio.gather(
+        asyncio.to_thread(get_sol, client.auth.user_id),
+        asyncio.to_thread(get_nos_units, client.auth.user_id),
+    )
+    # 0.01 SOL for the vault plus headroom for fees and rent, and 3 NOS
+    min_sol_lamports = round(0.012 * LAMPORTS_PER_SOL)
+    min_nos_units = 3 * NOS_UNITS_PER_NOS
+    if sol_lamports < min_sol_lamports or nos_units < min_nos_units:
+        need_sol = max(0, min_sol_lamports - sol_lamports) / LAMPORTS_PER_SOL
+        need_nos = max(0, min_nos_units - nos_units) / NOS_UNITS_PER_NOS
         print(f"⚠️  Low wallet balance. Top up before running:")
         if need_sol>0: print(f"   - Add at least {need_sol:.4f} SOL")
         if need_nos>0: print(f"   - Add at least {need_nos:.3f} NOS")
@@ -117,16 +142,23 @@ async def main() -> None:
     print("\n💰 Funding vault with 0.01 SOL and 3 NOS...")
     vault = client.get_vault(deployment.vault)
     try:
-        sol_sig = await vault.topup(sol=0.01)
-        print(f"   ✅ SOL tx: {sol_sig}")
-        nos_sig = await vault.topup(nos=3.0)
-        print(f"   ✅ NOS tx: {nos_sig}")
+        topup_sig = await vault.topup(sol=0.01, nos=3.0)
+        print(f"   ✅ Topup tx: {topup_sig}")
     except Exception as fund_err:
         print(f"❌ Funding failed: {fund_err}")
         return
 
-    # Optional short wait for balance reflection
-    await asyncio.sleep(5)
+    # Wait until the deployment manager sees the funded vault balance
+    async def vault_funded() -> bool:
+        try:
+            # Bypass the SDK's short balance cache - we are polling for a change
+            balance = await vault.get_balance(fresh=True)
+        except Exception:
+            return False
+        return balance.get("NOS", 0) >= 3.0
+
+    if not await wait_until(vault_funded):
+        print("⚠️  Vault balance not reflected yet, starting anyway")
 
     # Start the deployment
     print("\n🚀 Starting deployment...")
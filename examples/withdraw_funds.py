@@ -7,14 +7,50 @@ Set WALLET_PRIVATE_KEY environment variable with your wallet private key.
 """
 
 import asyncio
+import logging
 import os
+import re
 from dotenv import load_dotenv
-from nosana_deployments import create_nosana_deployment_client
+from nosana_deployments import create_nosana_deployment_client, LAMPORTS_PER_SOL
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Vaults processed at the same time
+MAX_CONCURRENT_VAULTS = 8
+
+# Balances (SOL / NOS) below this are not worth a withdrawal transaction
+MIN_WITHDRAW_BALANCE = 0.0001
+
+# Keywords in an error message that point at a known failure, checked in this order
+_ERROR_KEYWORDS = re.compile(r"\b(401|404|500|unauthorized|insufficient)", re.IGNORECASE)
+_ERROR_PRIORITY = ("401", "404", "500", "insufficient")
+
+VAULT_LIST_HINTS = {
+    "401": "   🔍 This is an authentication error - the nacl signature fix may not be working",
+    "404": "   🔍 Vaults endpoint not found - may need different API endpoint",
+    "500": "   🔍 Server error - authentication may be working but server has issues",
+}
+WITHDRAW_HINTS = {
+    "401": "   🔍 Authentication error - nacl signature may still have issues",
+    "404": "   🔍 Withdrawal endpoint not found",
+    "500": "   🔍 Server error - authentication may be working but server has issues",
+    "insufficient": "   🔍 Insufficient balance or funds error",
+}
+
+
+def classify_error(error: Exception):
+    """Return the most specific known failure kind in an error message, or None."""
+    found = {keyword.lower() for keyword in _ERROR_KEYWORDS.findall(str(error))}
+    if "unauthorized" in found:
+        found.add("401")
+    return next((kind for kind in _ERROR_PRIORITY if kind in found), None)
+
+
 async def withdraw_all_funds():
     """Withdraw all funds from vault deployments."""
+    client = None
     try:
         # Get private key from environment
         private_key = os.getenv("WALLET_PRIVATE_KEY")
@@ -44,68 +80,91 @@ async def withdraw_all_funds():
         except Exception as vault_list_error:
             print(f"❌ Failed to get vaults: {vault_list_error}")
             
-            # Check if it's an authentication error
-            if "401" in str(vault_list_error) or "unauthorized" in str(vault_list_error).lower():
-                print("   🔍 This is an authentication error - the nacl signature fix may not be working")
-            elif "404" in str(vault_list_error):
-                print("   🔍 Vaults endpoint not found - may need different API endpoint")
-            elif "500" in str(vault_list_error):
-                print("   🔍 Server error - authentication may be working but server has issues")
+            # Explain known failure kinds (authentication, missing endpoint, server error)
+            hint = VAULT_LIST_HINTS.get(classify_error(vault_list_error))
+            if hint:
+                print(hint)
                 
             return
         
-        # Test each vault for balances and attempt withdrawal
-        for i, vault_data in enumerate(vaults):
-            vault_address = vault_data.get("address") or vault_data.get("vault") or vault_data.get("id")
-            print(f"\n🏦 Vault {i+1}: {vault_address}")
+        # Prefetch every vault balance in one RPC round trip; vaults missing
+        # from the result fall back to an individual balance check
+        addresses = [v.get("address") or v.get("vault") or v.get("id") for v in vaults]
+        try:
+            balances = await client.get_vault_balances([a for a in addresses if a])
+        except Exception as prefetch_error:
+            print(f"   ⚠️  Balance prefetch failed, checking vaults one by one: {prefetch_error}")
+            balances = {}
+        
+        # Check balances and withdraw from all vaults concurrently, streaming
+        # results as they complete; the semaphore keeps us under the public
+        # RPC's rate limits
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_VAULTS)
+        
+        async def process_vault(i, vault_address):
+            # Collect output per vault so concurrent vaults don't interleave
+            lines = []
+            lines.append(f"\n🏦 Vault {i+1}: {vault_address}")
             
             # Get vault instance
             vault = client.get_vault(vault_address)
             
-            # Get balance
-            print("   💰 Checking balance...")
-            try:
-                balance = await vault.get_balance()
-                sol_balance = balance.get("SOL", 0) / 1e9  # Convert from lamports
-                nos_balance = balance.get("NOS", 0)
-                
-                print(f"      SOL: {sol_balance:.6f}")
-                print(f"      NOS: {nos_balance:.6f}")
-                
-                # Only attempt withdrawal if there's a meaningful balance
-                if sol_balance > 0.0001 or nos_balance > 0.0001:
-                    print("   🏃 Attempting withdrawal...")
+            async with semaphore:
+                # Get balance
+                lines.append("   💰 Checking balance...")
+                try:
+                    balance = balances.get(vault_address) or await vault.get_balance()
+                    sol_balance = balance.get("SOL", 0) / LAMPORTS_PER_SOL  # Convert from lamports
+                    nos_balance = balance.get("NOS", 0)
                     
-                    # Test withdrawal
-                    try:
-                        signature = await vault.withdraw()
-                        print(f"   ✅ Withdrawal successful!")
-                        print(f"      Signature: {signature}")
-                        print(f"      View: https://solscan.io/tx/{signature}")
-                        
-                    except Exception as withdraw_error:
-                        print(f"   ❌ Withdrawal failed: {withdraw_error}")
+                    lines.append(f"      SOL: {sol_balance:.6f}")
+                    lines.append(f"      NOS: {nos_balance:.6f}")
+                    
+                    # Only attempt withdrawal if there's a meaningful balance
+                    if sol_balance > MIN_WITHDRAW_BALANCE or nos_balance > MIN_WITHDRAW_BALANCE:
+                        lines.append("   🏃 Attempting withdrawal...")
                         
-                        # Check if it's an authentication error
-                        if "401" in str(withdraw_error) or "unauthorized" in str(withdraw_error).lower():
-                            print("   🔍 Authentication error - nacl signature may still have issues")
-                        elif "404" in str(withdraw_error):
-                            print("   🔍 Withdrawal endpoint not found")
-                        elif "500" in str(withdraw_error):
-                            print("   🔍 Server error - authentication may be working but server has issues")
-                        elif "insufficient" in str(withdraw_error).lower():
-                            print("   🔍 Insufficient balance or funds error")
+                        # Test withdrawal
+                        try:
+                            signature = await vault.withdraw()
+                            lines.append(f"   ✅ Withdrawal successful!")
+                            lines.append(f"      Signature: {signature}")
+                            lines.append(f"      View: https://solscan.io/tx/{signature}")
+                            
+                        except Exception as withdraw_error:
+                            lines.append(f"   ❌ Withdrawal failed: {withdraw_error}")
+                            
+                            # Explain known failure kinds (authentication, endpoint, server, funds)
+                            hint = WITHDRAW_HINTS.get(classify_error(withdraw_error))
+                            if hint:
+                                lines.append(hint)
+                            
+                    else:
+                        lines.append("   ⏭️  Skipping - balance too low")
                         
-                else:
-                    print("   ⏭️  Skipping - balance too low")
-                    
-            except Exception as balance_error:
-                print(f"   ❌ Balance check failed: {balance_error}")
+                except Exception as balance_error:
+                    lines.append(f"   ❌ Balance check failed: {balance_error}")
+            
+            return lines
+        
+        async def handle(i, vault_address):
+            # Report unexpected errors per vault so one failure doesn't abort the rest
+            try:
+                return await process_vault(i, vault_address)
+            except Exception as vault_error:
+                return [f"\n🏦 Vault {i+1}: {vault_address}", f"   ❌ {vault_error}"]
+        
+        # Print each vault's report as soon as it finishes
+        for finished in asyncio.as_completed([handle(i, a) for i, a in enumerate(addresses)]):
+            print("\n".join(await finished))
         
     except Exception as e:
-        print(f"❌ Withdrawal failed: {e}")
-        import traceback
-        traceback.print_exc()
+        # Traceback is only formatted if a logging handler emits the record
+        logger.exception("❌ Withdrawal failed: %s", e)
+    finally:
+        # Release pooled API and Solana RPC connections
+        if client is not None:
+            await client.aclose()
 
 if __name__ == "__main__":
     asyncio.run(withdraw_all_funds())
\ No newline at end of file
@@ -32,7 +32,7 @@ Example:
 from .client import create_nosana_deployment_client
 from .models.deployment import Deployment, DeploymentStrategy, DeploymentStatus
 from .ipfs import upload_job_to_ipfs
-from .vault import create_vault
+from .vault import create_vault, LAMPORTS_PER_SOL, NOS_UNITS_PER_NOS
 
 __version__ = "0.1.0"
 __all__ = [
@@ -42,4 +42,6 @@ __all__ = [
     "DeploymentStatus",
     "upload_job_to_ipfs",
     "create_vault",
+    "LAMPORTS_PER_SOL",
+    "NOS_UNITS_PER_NOS",
 ]
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""JSON encoding helpers for Nosana Deployments SDK.
+
+Uses orjson when it is installed (``pip install nosana-deployments[speedups]``)
+and falls back to the standard library otherwise.
+"""
+
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JSON_HEADERS: Dict[str, str] = {"Content-Type": "application/json"}
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
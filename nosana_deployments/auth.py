@@ -4,6 +4,8 @@ import time
 from typing import Dict
 from solders.keypair import Keypair
 import base58
+import nacl.encoding
+import nacl.signing
 
 
 class WalletAuth:
@@ -12,9 +14,14 @@ class WalletAuth:
     def __init__(self, wallet: Keypair):
         self.wallet = wallet
         self.user_id = str(wallet.pubkey())
+        
+        # Base message and its signature never change: ed25519 signatures are
+        # deterministic, so sign once here instead of on every request.
+        # Only the timestamp suffix varies per request.
+        self._auth_prefix = self._sign_auth_message()
     
-    def generate_auth_headers(self) -> Dict[str, str]:
-        """Generate authentication headers matching TypeScript SDK exactly."""
+    def _sign_auth_message(self) -> str:
+        """Sign the base auth message, returning "message:signature_base58"."""
         # Create base message (same as TypeScript SDK)
         message = "DeploymentsAuthorization"
         
@@ -23,9 +30,6 @@ class WalletAuth:
         
         # Use the private key bytes directly for nacl-style signature
         # This matches the TypeScript SDK's nacl.sign.detached behavior
-        import nacl.signing
-        import nacl.encoding
-        
         # Create signing key from our wallet's private key
         private_key_bytes = bytes(self.wallet.secret())
         signing_key = nacl.signing.SigningKey(private_key_bytes[:32])  # Use first 32 bytes
@@ -35,14 +39,17 @@ class WalletAuth:
         
         # Encode signature as Base58 (like TypeScript SDK)
         signature_b58 = base58.b58encode(signature).decode('ascii')
-        
+        return f"{message}:{signature_b58}"
+    
+    def generate_auth_headers(self) -> Dict[str, str]:
+        """Generate authentication headers matching TypeScript SDK exactly."""
         # Create timestamp (includeTime: true like TypeScript deployments service)
         timestamp = int(time.time() * 1000)  # Milliseconds like TypeScript
         
         # Create auth string: message:signature_base58:timestamp (matching includeTime: true)
-        auth_string = f"{message}:{signature_b58}:{timestamp}"
+        auth_string = f"{self._auth_prefix}:{timestamp}"
         
         return {
             "x-user-id": self.user_id,
             "authorization": auth_string
-        }
\ No newline at end of file
+        }
@@ -4,15 +4,38 @@ Nosana Deployments Client - matches TypeScript SDK structure exactly.
 
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import Dict, List, Union, Any, Optional
+import time
+from typing import Callable, Dict, Generator, Iterable, List, Union, Any, Optional, Tuple
 
 from solders.keypair import Keypair
 import httpx
 
-from .models.deployment import Deployment, DeploymentCreateRequest
+from .models.deployment import Deployment, DeploymentCreateRequest, DeploymentStatus
 from .auth import WalletAuth
-from .vault import create_vault
+from .vault import Vault, create_vault, fetch_vault_balances
+from . import _json
+
+# Accepted truthy values for boolean environment flags
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+
+# Statuses wait_for_status returns on by default: the deployment has either
+# started or settled and will not change again without user action
+DEFAULT_WAIT_STATUSES = frozenset({
+    DeploymentStatus.RUNNING,
+    DeploymentStatus.ERROR,
+    DeploymentStatus.STOPPED,
+    DeploymentStatus.INSUFFICIENT_FUNDS,
+    DeploymentStatus.ARCHIVED,
+})
+
+# Backoff between deployment status polls (seconds)
+WAIT_BACKOFF_BASE = 1.0
+WAIT_BACKOFF_CAP = 10.0
+
+# Deployments remembered with their ETag for conditional GETs
+DEPLOYMENT_CACHE_SIZE = 256
 
 
 class DeploymentsClient:
@@ -28,27 +51,72 @@ class DeploymentsClient:
         self.base_url = manager.rstrip("/")
         self.wallet = wallet
         self.auth = WalletAuth(wallet)
+        # Environment does not change during the process lifetime; read once
+        self._debug = os.getenv("NOSANA_SDK_DEBUG", "").strip().lower() in _TRUE_VALUES
         self._client = httpx.Client(
             base_url=self.base_url,
             timeout=30.0,
             headers={"User-Agent": "nosana-deployments-python/0.1.0"}
         )
+        # Non-blocking client for Solana RPC calls made by vaults, created on
+        # first use for the running event loop, see _rpc_client
+        self._rpc_http: Optional[httpx.AsyncClient] = None
+        self._rpc_loop: Optional[asyncio.AbstractEventLoop] = None
+        # vault public key -> (balance, fetched_at), see Vault.get_balance
+        self._balance_cache: Dict[str, Tuple[Dict[str, float], float]] = {}
+        # deployment id -> (etag, deployment), see get()
+        self._deployment_cache: Dict[str, Tuple[str, Deployment]] = {}
+        # deployment id -> (etag, status), see get_status()
+        self._status_cache: Dict[str, Tuple[str, str]] = {}
+        # vault public key -> Vault, see get_vault()
+        self._vaults: Dict[str, Vault] = {}
     
-    def _request(self, method: str, path: str, json: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make authenticated API request."""
+    @property
+    def _rpc_client(self) -> httpx.AsyncClient:
+        """Async Solana RPC client bound to the running event loop.
+        
+        Pooled connections belong to the loop that opened them, so a new
+        client is created when called from a different loop (e.g. a second
+        asyncio.run on the same DeploymentsClient).
+        """
+        loop = asyncio.get_running_loop()
+        if self._rpc_loop is not loop:
+            self._rpc_http = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=10)
+            )
+            self._rpc_loop = loop
+        return self._rpc_http
+    
+    def _send(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Make authenticated API request and return the raw response.
+        
+        Error statuses raise; a 304 Not Modified (answer to a conditional
+        request) is returned as-is.
+        """
         headers = self.auth.generate_auth_headers()
+        if extra_headers:
+            headers.update(extra_headers)
         
         # Only add content-type when actually sending JSON data
         if json is not None:
             headers["content-type"] = "application/json"
         
         try:
-            response = self._client.request(method, path, json=json, headers=headers)
-            response.raise_for_status()
-            return response.json()
+            content = _json.dumps(json) if json is not None else None
+            response = self._client.request(method, path, content=content, headers=headers)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
         except Exception as e:
             # Enhanced error logging for debugging (opt-in)
-            if os.getenv("NOSANA_SDK_DEBUG") and hasattr(e, 'response') and e.response:
+            if self._debug and hasattr(e, 'response') and e.response:
                 print(f"   🔍 Request details:")
                 print(f"      Method: {method}")
                 print(f"      URL: {self.base_url}{path}")
@@ -63,6 +131,10 @@ class DeploymentsClient:
                     print(f"      Could not read error response body")
             raise
     
+    def _request(self, method: str, path: str, json: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make authenticated API request."""
+        return _json.loads(self._send(method, path, json=json).content)
+    
     def create(self, deployment_body: Dict[str, Any]) -> Deployment:
         """Create a new deployment."""
         # Validate request
@@ -78,12 +150,49 @@ class DeploymentsClient:
         return deployment
     
     def get(self, deployment_id: str) -> Deployment:
-        """Get deployment by ID."""
-        data = self._request("GET", f"/api/deployment/{deployment_id}")
-        deployment = Deployment.model_validate(data)
+        """Get deployment by ID.
+        
+        When the API sent an ETag for this deployment before, the request is
+        made conditional; on 304 Not Modified the previously built Deployment is
+        returned without re-validating the body.
+        """
+        cached = self._deployment_cache.get(deployment_id)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        
+        response = self._send("GET", f"/api/deployment/{deployment_id}", extra_headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        
+        deployment = Deployment.model_validate(_json.loads(response.content))
         deployment._client = self
+        
+        etag = response.headers.get("etag")
+        if etag:
+            _cache_put(self._deployment_cache, deployment_id, (etag, deployment))
+            _cache_put(self._status_cache, deployment_id, (etag, deployment.status))
         return deployment
     
+    def get_status(self, deployment_id: str) -> str:
+        """Get only the status of a deployment.
+        
+        Reads the status straight from the response JSON without validating a
+        full Deployment model, which is all a polling loop needs. The ETag of
+        each response is remembered, so repeated polls are conditional and an
+        unchanged deployment costs a bodyless 304.
+        """
+        cached = self._status_cache.get(deployment_id)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        
+        response = self._send("GET", f"/api/deployment/{deployment_id}", extra_headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        
+        status = _json.loads(response.content)["status"]
+        etag = response.headers.get("etag")
+        if etag:
+            _cache_put(self._status_cache, deployment_id, (etag, status))
+        return status
+    
     def list(self) -> List[Deployment]:
         """List all deployments."""
         data = self._request("GET", "/api/deployments")
@@ -92,6 +201,67 @@ class DeploymentsClient:
             deployment._client = self
         return deployments
     
+    def wait_for_status(
+        self,
+        deployment_id: str,
+        target_states: Iterable[str] = DEFAULT_WAIT_STATUSES,
+        timeout: float = 600.0,
+        on_change: Optional[Callable[[str], None]] = None,
+    ) -> Deployment:
+        """Poll a deployment until it reaches one of the target statuses.
+        
+        The API has no long-poll endpoint, so the status is polled (get_status) with
+        exponential backoff (1s, 2s, 4s, ... capped at 10s) rather than on a
+        fixed interval: quick transitions are seen within a second or two, and
+        long waits cost few requests.
+        
+        Blocks the calling thread while waiting; from async code use
+        wait_for_status_async so the event loop keeps running.
+        
+        Args:
+            deployment_id: Deployment ID
+            target_states: Statuses to stop on
+            timeout: Maximum time to wait in seconds
+            on_change: Called with the new status whenever it changes
+            
+        Returns:
+            The deployment, once its status is one of ``target_states``
+            
+        Raises:
+            TimeoutError: If no target status is reached within ``timeout``
+        """
+        steps = _wait_steps(deployment_id, target_states, timeout, on_change)
+        next(steps)
+        while True:
+            # Poll the bare status; only the final deployment is fully loaded
+            status = self.get_status(deployment_id)
+            try:
+                time.sleep(steps.send(status))
+            except StopIteration:
+                return self.get(deployment_id)
+    
+    async def wait_for_status_async(
+        self,
+        deployment_id: str,
+        target_states: Iterable[str] = DEFAULT_WAIT_STATUSES,
+        timeout: float = 600.0,
+        on_change: Optional[Callable[[str], None]] = None,
+    ) -> Deployment:
+        """Awaitable wait_for_status for use from async code.
+        
+        Takes the same arguments and polls on the same schedule, but each
+        request runs in a worker thread and the waits use asyncio.sleep, so
+        other tasks keep running.
+        """
+        steps = _wait_steps(deployment_id, target_states, timeout, on_change)
+        next(steps)
+        while True:
+            status = await asyncio.to_thread(self.get_status, deployment_id)
+            try:
+                await asyncio.sleep(steps.send(status))
+            except StopIteration:
+                return await asyncio.to_thread(self.get, deployment_id)
+    
     def pipe(
         self, 
         deployment_id_or_create_object: Union[str, Dict[str, Any]], 
@@ -117,6 +287,23 @@ class DeploymentsClient:
     
     
     
+    def get_vaults(self) -> List[Dict[str, str]]:
+        """List the vaults of all deployments owned by this wallet.
+        
+        Reads the raw deployment list, without building a Deployment model per
+        row, since only the vault and deployment IDs are needed.
+        
+        Returns:
+            One {"address": vault, "deployment": deployment_id} dict per vault
+        """
+        data = self._request("GET", "/api/deployments")
+        vaults = {}
+        for deployment in data:
+            address = deployment.get("vault")
+            if address and address not in vaults:
+                vaults[address] = {"address": address, "deployment": deployment.get("id")}
+        return list(vaults.values())
+    
     def get_vault(self, vault_id: str):
         """Get vault instance for managing vault operations.
         
@@ -126,11 +313,76 @@ class DeploymentsClient:
         Returns:
             Vault instance with topup, withdraw, getBalance methods
         """
-        return create_vault(vault_id, self.wallet, self)
+        # Vaults are stateless wrappers around this client - reuse one per address
+        vault = self._vaults.get(vault_id)
+        if vault is None:
+            vault = self._vaults[vault_id] = create_vault(vault_id, self.wallet, self)
+        return vault
+    
+    async def get_vault_balances(self, vault_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """Get balances for several vaults with a single Solana RPC round trip.
+        
+        Args:
+            vault_ids: Vault public keys
+            
+        Returns:
+            Vault public key -> {"SOL": lamports, "NOS": NOS}, like Vault.get_balance
+        """
+        return await fetch_vault_balances(self._rpc_client, vault_ids)
     
     def close(self) -> None:
         """Close HTTP client."""
         self._client.close()
+    
+    async def aclose(self) -> None:
+        """Close the API client and the async Solana RPC client shared by vaults."""
+        if self._rpc_http is not None and self._rpc_loop is asyncio.get_running_loop():
+            await self._rpc_http.aclose()
+        self._rpc_http = None
+        self._rpc_loop = None
+        self._client.close()
+
+
+def _wait_steps(
+    deployment_id: str,
+    target_states: Iterable[str],
+    timeout: float,
+    on_change: Optional[Callable[[str], None]],
+) -> Generator[float, str, None]:
+    """Backoff and timeout state shared by wait_for_status and wait_for_status_async.
+    
+    Prime with next(), then send each polled status: yields the seconds to wait
+    before the next poll, and stops once the status is one of ``target_states``.
+    """
+    targets = frozenset(target_states)
+    deadline = time.monotonic() + timeout
+    delay = WAIT_BACKOFF_BASE
+    last_status = None
+    status = yield 0.0
+    while True:
+        if status != last_status:
+            if on_change is not None:
+                on_change(status)
+            last_status = status
+        if status in targets:
+            return
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(
+                f"Deployment {deployment_id} still {status} after {timeout:.0f}s"
+            )
+        status = yield min(delay, remaining)
+        delay = min(delay * 2, WAIT_BACKOFF_CAP)
+
+
+def _cache_put(cache: Dict[str, Any], key: str, value: Any) -> None:
+    """Store ``value`` in a FIFO cache bounded by DEPLOYMENT_CACHE_SIZE."""
+    cache.pop(key, None)
+    if len(cache) >= DEPLOYMENT_CACHE_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        del cache[next(iter(cache))]
+    cache[key] = value
 
 
 def create_nosana_deployment_client(manager: str, key: Union[str, Keypair]) -> DeploymentsClient:
@@ -161,4 +413,4 @@ def create_nosana_deployment_client(manager: str, key: Union[str, Keypair]) -> D
     else:
         wallet = key
     
-    return DeploymentsClient(manager=manager, wallet=wallet)
\ No newline at end of file
+    return DeploymentsClient(manager=manager, wallet=wallet)
@@ -1,9 +1,10 @@
 """IPFS upload functionality for Nosana Deployments SDK."""
 
-import json
 import requests
 from typing import Dict, Any, Optional
 
+from . import _json
+
 
 class IPFSClient:
     """IPFS client using Pinata Cloud like the TypeScript SDK."""
@@ -57,13 +58,13 @@ class IPFSClient:
             
             response = requests.post(
                 f"{self.api_url}/pinning/pinJSONToIPFS",
-                json=data,
+                data=_json.dumps(data),
                 headers=headers,
                 timeout=30
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json.loads(response.content)
                 return result["IpfsHash"]
             else:
                 raise Exception(f"Pinata upload failed: {response.status_code} - {response.text}")
@@ -1,7 +1,12 @@
 """Vault functionality for Nosana Deployments SDK."""
 
-from typing import Dict, Optional
-import requests
+import asyncio
+import functools
+import logging
+import random
+import struct
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.transaction import Transaction, VersionedTransaction
@@ -10,11 +15,224 @@ from solders.hash import Hash
 from solders.message import Message, MessageV0
 from solders.instruction import Instruction, AccountMeta
 import base64
+import httpx
+
+from . import _json
+
+logger = logging.getLogger(__name__)
+
+# NOS token mint address (mainnet)
+NOS_MINT = "nosXBVoaCTtYdLvKY6Csb4AC8JCdQKKAaWYtx2ZMoo7"
+
+# Smallest-unit conversions (SOL has 9 decimals, NOS has 6)
+LAMPORTS_PER_SOL = 1_000_000_000
+NOS_UNITS_PER_NOS = 1_000_000
+
+# Token Program ID and Associated Token Program ID (standard Solana addresses)
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+ASSOCIATED_TOKEN_PROGRAM_ID = "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
+SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
+SYSVAR_RENT_ID = "SysvarRent111111111111111111111111111111111"
+
+# Parsed once at import time - these never change
+NOS_MINT_PUBKEY = Pubkey.from_string(NOS_MINT)
+TOKEN_PROGRAM_PUBKEY = Pubkey.from_string(TOKEN_PROGRAM_ID)
+ASSOC_TOKEN_PROGRAM_PUBKEY = Pubkey.from_string(ASSOCIATED_TOKEN_PROGRAM_ID)
+SYSTEM_PROGRAM_PUBKEY = Pubkey.from_string(SYSTEM_PROGRAM_ID)
+SYSVAR_RENT_PUBKEY = Pubkey.from_string(SYSVAR_RENT_ID)
+_TOKEN_PROGRAM_BYTES = bytes(TOKEN_PROGRAM_PUBKEY)
+
+# SPL Token Transfer instruction data: u8 instruction tag (3) + u64 LE amount
+SPL_TRANSFER_INSTRUCTION = 3
+_SPL_TRANSFER_DATA = struct.Struct("<BQ")
+
+# SPL token account layout: mint (32) + owner (32) + amount (u64 LE) + ...
+SPL_TOKEN_AMOUNT_OFFSET = 64
+_SPL_TOKEN_AMOUNT = struct.Struct("<Q")
+
+# getMultipleAccounts accepts at most this many pubkeys per call
+MAX_MULTIPLE_ACCOUNTS = 100
+
+# Seconds a vault balance is served from cache before it is fetched again
+BALANCE_CACHE_TTL = 2.0
+
+# Retry policy for transient Solana RPC failures (seconds for backoff values)
+RPC_MAX_RETRIES = 3
+RPC_BACKOFF_BASE = 0.5
+RPC_BACKOFF_CAP = 10.0
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Confirmation loop for sent transactions (seconds)
+CONFIRM_POLL_INTERVAL = 0.5
+REBROADCAST_INTERVAL = 2.0
+CONFIRM_TIMEOUT = 90.0
+_CONFIRMED_STATUSES = frozenset({"confirmed", "finalized"})
+
+
+@functools.lru_cache(maxsize=1024)
+def derive_ata(owner: Pubkey, mint: Pubkey = NOS_MINT_PUBKEY) -> Pubkey:
+    """Derive the Associated Token Account address for an owner and mint.
+    
+    Matches Solana's getAssociatedTokenAddressSync. The result is deterministic,
+    so it is memoized for the lifetime of the process.
+    """
+    seeds = [bytes(owner), _TOKEN_PROGRAM_BYTES, bytes(mint)]
+    ata_pubkey, _ = Pubkey.find_program_address(seeds, ASSOC_TOKEN_PROGRAM_PUBKEY)
+    return ata_pubkey
+
+
+@functools.lru_cache(maxsize=1024)
+def _ata_address(owner: Pubkey, mint: Pubkey = NOS_MINT_PUBKEY) -> str:
+    """Base58 string form of derive_ata, memoized for use in RPC params."""
+    return str(derive_ata(owner, mint))
+
+
+def _is_insufficient_funds(error: Dict[str, Any], instruction_index: int, include_fee_errors: bool = False) -> bool:
+    """Check whether a sendTransaction preflight error means the sender lacks funds.
+    
+    Both the System Program transfer and the SPL Token transfer report this as
+    custom error 0x1 on the failing instruction.
+    
+    Args:
+        error: JSON-RPC error object from sendTransaction
+        instruction_index: Index of the transfer instruction in the transaction
+        include_fee_errors: Also treat fee/rent shortfalls of the payer as insufficient funds
+    
+    A rent shortfall on any other account (e.g. a SOL topup below the rent-exempt
+    minimum into an empty vault) is not the payer's balance and returns False.
+    """
+    data = error.get("data")
+    err = data.get("err") if isinstance(data, dict) else None
+    
+    if isinstance(err, dict):
+        instruction_error = err.get("InstructionError")
+        if instruction_error:
+            return instruction_error[0] == instruction_index and instruction_error[1] == {"Custom": 1}
+        rent_error = err.get("InsufficientFundsForRent")
+        # Account 0 is the fee payer, i.e. the sending wallet
+        return include_fee_errors and isinstance(rent_error, dict) and rent_error.get("account_index") == 0
+    
+    return include_fee_errors and err == "InsufficientFundsForFee"
+
+
+async def _post_rpc(rpc_client: httpx.AsyncClient, rpc_url: str, payload: Any) -> httpx.Response:
+    """POST a JSON-RPC payload to Solana over a shared connection pool.
+    
+    Rate limiting (429), server errors (5xx) and connection failures are
+    retried with full-jitter exponential backoff. Any other response,
+    including JSON-RPC errors such as a failed preflight, is returned as-is.
+    """
+    content = _json.dumps(payload)
+    attempt = 0
+    while True:
+        try:
+            response = await rpc_client.post(rpc_url, content=content, headers=_json.JSON_HEADERS)
+            if response.status_code not in _RETRYABLE_STATUS_CODES or attempt >= RPC_MAX_RETRIES:
+                return response
+        except httpx.TransportError:
+            if attempt >= RPC_MAX_RETRIES:
+                raise
+    
+        delay = random.uniform(0, min(RPC_BACKOFF_CAP, RPC_BACKOFF_BASE * 2 ** attempt))
+        attempt += 1
+        logger.debug("Retrying RPC call in %.2fs (attempt %d/%d)", delay, attempt, RPC_MAX_RETRIES)
+        await asyncio.sleep(delay)
+
+
+async def _rpc_batch(rpc_client: httpx.AsyncClient, rpc_url: str, calls: List[Tuple[str, List[Any]]]) -> List[Dict[str, Any]]:
+    """Send several JSON-RPC calls to Solana in a single HTTP request.
+    
+    Args:
+        rpc_client: Async HTTP client to send the request with
+        rpc_url: Solana RPC endpoint
+        calls: (method, params) pairs
+    
+    Returns:
+        One response object per call, in the same order as ``calls``
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = await _post_rpc(rpc_client, rpc_url, payload)
+    response.raise_for_status()
+    
+    results = _json.loads(response.content)
+    if not isinstance(results, list):
+        raise Exception(f"Unexpected RPC batch response: {results}")
+    
+    # Batch responses may come back in any order - match them by id
+    by_id = {item.get("id"): item for item in results}
+    return [by_id.get(i, {}) for i in range(len(calls))]
+
+
+def _token_account_amount(account: Optional[Dict[str, Any]]) -> int:
+    """Read the raw amount from a base64-encoded SPL token account, 0 if it does not exist."""
+    if not account:
+        return 0
+    data = base64.b64decode(account["data"][0])
+    if len(data) < SPL_TOKEN_AMOUNT_OFFSET + _SPL_TOKEN_AMOUNT.size:
+        return 0
+    return _SPL_TOKEN_AMOUNT.unpack_from(data, SPL_TOKEN_AMOUNT_OFFSET)[0]
+
+
+async def fetch_vault_balances(
+    rpc_client: httpx.AsyncClient,
+    vault_ids: List[str],
+    rpc_url: str = "https://api.mainnet-beta.solana.com",
+) -> Dict[str, Dict[str, float]]:
+    """Get SOL and NOS balances for many vaults in one Solana RPC round trip.
+    
+    The vault accounts and their NOS token accounts are read with
+    getMultipleAccounts (chunked to MAX_MULTIPLE_ACCOUNTS keys per call, all
+    batched into one HTTP request). Lamports come straight from the account,
+    and the NOS amount is read from the token account data without decoding
+    the rest of the layout.
+    
+    Args:
+        rpc_client: Async HTTP client to send the request with
+        vault_ids: Vault public keys
+        rpc_url: Solana RPC endpoint
+        
+    Returns:
+        Vault public key -> {"SOL": lamports, "NOS": NOS}, same shape as Vault.get_balance
+    """
+    vault_ids = list(dict.fromkeys(vault_ids))
+    if not vault_ids:
+        return {}
+    
+    keys = vault_ids + [_ata_address(Pubkey.from_string(vault_id)) for vault_id in vault_ids]
+    calls = [
+        ("getMultipleAccounts", [keys[i:i + MAX_MULTIPLE_ACCOUNTS], {"encoding": "base64"}])
+        for i in range(0, len(keys), MAX_MULTIPLE_ACCOUNTS)
+    ]
+    
+    accounts = []
+    for result in await _rpc_batch(rpc_client, rpc_url, calls):
+        if "error" in result:
+            raise Exception(f"RPC error: {result['error']}")
+        if "result" not in result:
+            raise Exception("Failed to get vault accounts")
+        accounts.extend(result["result"]["value"])
+    
+    count = len(vault_ids)
+    return {
+        vault_id: {
+            "SOL": sol_account["lamports"] if sol_account else 0,
+            "NOS": _token_account_amount(nos_account) / NOS_UNITS_PER_NOS,
+        }
+        for vault_id, sol_account, nos_account in zip(vault_ids, accounts[:count], accounts[count:])
+    }
 
 
 class Vault:
     """Vault class matching TypeScript SDK interface exactly."""
     
+    __slots__ = (
+        "public_key", "wallet", "client",
+        "_public_key_pk", "_wallet_pk", "_nos_ata_pk", "_nos_ata",
+    )
+    
     def __init__(self, public_key: str, wallet: Keypair, client):
         """Initialize vault.
         
@@ -26,125 +244,171 @@ class Vault:
         self.public_key = public_key
         self.wallet = wallet
         self.client = client
+        
+        # Parsed once so transfers and ATA lookups skip the base58 round trip
+        self._public_key_pk = Pubkey.from_string(public_key)
+        self._wallet_pk = wallet.pubkey()
+        
+        # The vault's NOS token account is fixed, so derive it once
+        self._nos_ata_pk = derive_ata(self._public_key_pk)
+        self._nos_ata = str(self._nos_ata_pk)
     
-    async def get_balance(self) -> Dict[str, float]:
+    async def get_balance(self, fresh: bool = False) -> Dict[str, float]:
         """Get vault balance in SOL and NOS.
         
+        Balances are cached on the client for BALANCE_CACHE_TTL seconds, so
+        back-to-back calls share one API request. topup and withdraw drop the
+        cached entry.
+        
+        Args:
+            fresh: Skip the cache and always fetch, e.g. when polling for a change
+            
         Returns:
             Dictionary with SOL and NOS balances
         """
-        # Get vault info directly from API
-        vault_info = self.client._request("GET", f"/api/vault/{self.public_key}")
-        return {
+        cached = None if fresh else self.client._balance_cache.get(self.public_key)
+        if cached and time.monotonic() - cached[1] < BALANCE_CACHE_TTL:
+            return dict(cached[0])
+        
+        # Get vault info directly from API (off the event loop - the API client is synchronous)
+        vault_info = await asyncio.to_thread(self.client._request, "GET", f"/api/vault/{self.public_key}")
+        balance = {
             "SOL": vault_info.get("sol", 0),
             "NOS": vault_info.get("nos", 0)
         }
+        self.client._balance_cache[self.public_key] = (balance, time.monotonic())
+        return dict(balance)
+    
+    async def _post_rpc(self, rpc_url: str, payload: Any) -> httpx.Response:
+        """POST a JSON-RPC payload over the client's shared connection pool, see _post_rpc."""
+        return await _post_rpc(self.client._rpc_client, rpc_url, payload)
+    
+    async def _rpc_batch(self, rpc_url: str, calls: List[Tuple[str, List[Any]]]) -> List[Dict[str, Any]]:
+        """Send several JSON-RPC calls in one HTTP request, see _rpc_batch."""
+        return await _rpc_batch(self.client._rpc_client, rpc_url, calls)
     
     async def _get_balance_direct(self) -> Dict[str, float]:
         """Get balance directly from Solana RPC."""
         rpc_url = "https://api.mainnet-beta.solana.com"
         
         try:
-            # Get SOL balance
-            sol_response = requests.post(rpc_url, json={
-                "jsonrpc": "2.0",
-                "id": 1, 
-                "method": "getBalance",
-                "params": [self.public_key]
-            })
+            # Calculate Associated Token Account (ATA) address
+            # This matches TypeScript SDK's getAssociatedTokenAddressSync()
+            ata_address = self._nos_ata
             
-            sol_lamports = 0
-            if sol_response.status_code == 200:
-                result = sol_response.json()
-                if "result" in result:
-                    sol_lamports = result["result"]["value"]
+            # Get SOL and NOS balances in a single round trip
+            sol_result, nos_result = await self._rpc_batch(rpc_url, [
+                ("getBalance", [self.public_key]),
+                ("getTokenAccountBalance", [ata_address]),
+            ])
             
-            # Get NOS token balance using proper ATA calculation
-            nos_balance = await self._get_nos_token_balance(rpc_url)
+            sol_lamports = 0
+            if "result" in sol_result:
+                sol_lamports = sol_result["result"]["value"]
             
             return {
                 "SOL": sol_lamports,
-                "NOS": nos_balance
+                "NOS": self._parse_nos_token_balance(nos_result)
             }
             
         except Exception as e:
             return {"SOL": 0, "NOS": 0}
     
-    async def _get_nos_token_balance(self, rpc_url: str) -> float:
-        """Get NOS token balance from Associated Token Account.
+    @staticmethod
+    def _parse_blockhash(result: Dict[str, Any]) -> str:
+        """Extract the blockhash from a getLatestBlockhash response.
         
-        Matches the TypeScript SDK's getNosTokenAddressForAccount implementation.
+        A fresh blockhash is fetched for every transfer: reusing one would make
+        two identical transfers byte-identical, and the second would be rejected
+        as already processed.
         """
-        try:
-            # NOS token mint address (mainnet)
-            NOS_MINT = "nosXBVoaCTtYdLvKY6Csb4AC8JCdQKKAaWYtx2ZMoo7"
-            
-            # Calculate Associated Token Account (ATA) address
-            # This matches TypeScript SDK's getAssociatedTokenAddressSync()
-            ata_address = self._calculate_ata_address(self.public_key, NOS_MINT)
-            
-            # Query token account balance
-            token_response = requests.post(rpc_url, json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTokenAccountBalance", 
-                "params": [ata_address]
-            })
-            
-            if token_response.status_code == 200:
-                result = token_response.json()
-                if "result" in result and "value" in result["result"]:
-                    # Get raw atomic balance and convert to human-readable (6 decimals)
-                    atomic_balance = int(result["result"]["value"]["amount"])
-                    return atomic_balance / 1e6  # Convert from atomic units
-                
-            return 0.0  # Token account doesn't exist or has no balance
+        if "error" in result:
+            raise Exception(f"RPC error: {result['error']}")
+        if "result" not in result:
+            raise Exception("Failed to get recent blockhash")
+        
+        return result["result"]["value"]["blockhash"]
+    
+    async def _confirm_transactions(self, rpc_url: str, sent: List[Tuple[str, str, str]]) -> None:
+        """Rebroadcast sent transactions until they are confirmed or can no longer land.
+        
+        The status of every pending signature is fetched with a single
+        getSignatureStatuses call every CONFIRM_POLL_INTERVAL seconds, so the
+        call returns shortly after the last transaction lands. Public RPC nodes
+        drop transactions under load, so the identical signed bytes are also
+        re-sent (without preflight) every REBROADCAST_INTERVAL seconds, batched
+        with the poll. Raises once a pending transaction's blockhash has
+        expired, and gives up after CONFIRM_TIMEOUT seconds.
+        
+        Args:
+            rpc_url: Solana RPC endpoint
+            sent: (signature, base64 encoded transaction, blockhash) per transaction
             
-        except Exception as e:
-            print(f"   Debug: NOS balance error: {e}")
-            return 0.0
+        Raises:
+            TimeoutError: If a transaction is still unconfirmed after CONFIRM_TIMEOUT
+        """
+        pending = {signature: (encoded_tx, blockhash) for signature, encoded_tx, blockhash in sent}
+        started = last_sent = time.monotonic()
+        while pending and time.monotonic() - started < CONFIRM_TIMEOUT:
+            await asyncio.sleep(CONFIRM_POLL_INTERVAL)
+            signatures = list(pending)
+            blockhashes = list({blockhash for _, blockhash in pending.values()})
+            calls = [("getSignatureStatuses", [signatures])]
+            calls += [("isBlockhashValid", [blockhash, {"commitment": "confirmed"}]) for blockhash in blockhashes]
+            if time.monotonic() - last_sent >= REBROADCAST_INTERVAL:
+                calls += [
+                    ("sendTransaction", [encoded_tx, {"encoding": "base64", "skipPreflight": True, "maxRetries": 0}])
+                    for encoded_tx, _ in pending.values()
+                ]
+                last_sent = time.monotonic()
+            
+            results = await self._rpc_batch(rpc_url, calls)
+            
+            statuses = results[0].get("result", {}).get("value") or []
+            for signature, status in zip(signatures, statuses):
+                if not status:
+                    continue
+                if status.get("err"):
+                    raise Exception(f"Transaction {signature} failed: {status['err']}")
+                if status.get("confirmationStatus") in _CONFIRMED_STATUSES:
+                    del pending[signature]
+            
+            expired = {
+                blockhash for blockhash, result in zip(blockhashes, results[1:])
+                if result.get("result", {}).get("value") is False
+            }
+            for signature, (_, blockhash) in pending.items():
+                if blockhash in expired:
+                    raise Exception(f"Transaction {signature} expired before it was confirmed")
+        
+        if pending:
+            raise TimeoutError(
+                f"Transactions not confirmed after {CONFIRM_TIMEOUT:.0f}s: {', '.join(pending)}"
+            )
     
-    def _calculate_ata_address(self, wallet_address: str, mint_address: str) -> str:
-        """Calculate Associated Token Account address.
+    def _parse_nos_token_balance(self, result: Dict[str, Any]) -> float:
+        """Parse NOS token balance from a getTokenAccountBalance response.
         
-        This is a simplified implementation. For production, you should use
-        the proper SPL Token library or solders ATA calculation.
+        Matches the TypeScript SDK's getNosTokenAddressForAccount implementation.
         """
         try:
-            from solders.pubkey import Pubkey
-            import hashlib
-            
-            # Token Program ID and Associated Token Program ID (standard Solana addresses)
-            TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
-            ASSOCIATED_TOKEN_PROGRAM_ID = "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
-            
-            # Convert to Pubkey objects
-            wallet_pubkey = Pubkey.from_string(wallet_address)
-            mint_pubkey = Pubkey.from_string(mint_address)
-            token_program_pubkey = Pubkey.from_string(TOKEN_PROGRAM_ID)
-            assoc_token_program_pubkey = Pubkey.from_string(ASSOCIATED_TOKEN_PROGRAM_ID)
-            
-            # Find PDA (Program Derived Address) for ATA
-            # This matches Solana's getAssociatedTokenAddressSync logic
-            seeds = [
-                bytes(wallet_pubkey),
-                bytes(token_program_pubkey), 
-                bytes(mint_pubkey)
-            ]
-            
-            # Use solders to find the PDA
-            ata_pubkey, _ = Pubkey.find_program_address(seeds, assoc_token_program_pubkey)
-            
-            return str(ata_pubkey)
+            if "result" in result and "value" in result["result"]:
+                # Get raw atomic balance and convert to human-readable (6 decimals)
+                atomic_balance = int(result["result"]["value"]["amount"])
+                return atomic_balance / NOS_UNITS_PER_NOS  # Convert from atomic units
+                
+            return 0.0  # Token account doesn't exist or has no balance
             
         except Exception as e:
-            print(f"   Debug: ATA calculation error: {e}")
-            # Fallback - return empty string to indicate calculation failed
-            return ""
+            logger.debug("NOS balance error: %s", e)
+            return 0.0
     
     async def topup(self, sol: float = 0.0, nos: float = 0.0, lamports: bool = False) -> str:
         """Topup vault with SOL and/or NOS.
         
+        When both amounts are given, they are sent as a single transaction.
+        Returns once the transaction is confirmed.
+        
         Args:
             sol: Amount of SOL to transfer
             nos: Amount of NOS to transfer  
@@ -152,20 +416,33 @@ class Vault:
             
         Returns:
             Transaction signature
+            
+        Raises:
+            TimeoutError: If the transaction is not confirmed within CONFIRM_TIMEOUT;
+                it may still land, so check the signature before retrying
         """
         if sol <= 0 and nos <= 0:
             raise ValueError("Must specify positive amount for SOL or NOS")
         
-        signature = None
-        if sol > 0:
-            signature = await self._transfer_sol(sol, lamports)
+        sent = []
+        try:
+            if sol > 0 and nos > 0:
+                # Both transfers in one transaction: one fee, one send, one confirmation
+                sent.append(await self._transfer_nos(nos, lamports, sol=sol))
+            elif sol > 0:
+                sent.append(await self._transfer_sol(sol, lamports))
+            else:
+                sent.append(await self._transfer_nos(nos, lamports))
+            
+            # Rebroadcast until confirmed
+            rpc_url = "https://api.mainnet-beta.solana.com"
+            await self._confirm_transactions(rpc_url, sent)
+        finally:
+            self.client._balance_cache.pop(self.public_key, None)
         
-        if nos > 0:
-            signature = await self._transfer_nos(nos, lamports)
-            
-        return signature
+        return sent[-1][0]
     
-    async def _transfer_sol(self, amount: float, lamports: bool = False) -> str:
+    async def _transfer_sol(self, amount: float, lamports: bool = False) -> Tuple[str, str, str]:
         """Transfer SOL from user wallet to vault using proper Solana transaction building.
         
         Matches the TypeScript SDK implementation exactly.
@@ -175,50 +452,25 @@ class Vault:
             lamports: If True, amount is in lamports
             
         Returns:
-            Transaction signature
+            (signature, encoded transaction, blockhash) of the sent, unconfirmed transaction
         """
         try:
             # Convert to lamports if needed
-            lamport_amount = int(amount) if lamports else int(amount * 1_000_000_000)
+            lamport_amount = int(amount) if lamports else round(amount * LAMPORTS_PER_SOL)
             
             # Create public keys
-            from_pubkey = Pubkey.from_string(str(self.wallet.pubkey()))
-            to_pubkey = Pubkey.from_string(self.public_key)
+            from_pubkey = self._wallet_pk
+            to_pubkey = self._public_key_pk
             
             # RPC connection
             rpc_url = "https://api.mainnet-beta.solana.com"
             
-            # Check balance first (like TypeScript SDK)
-            balance_response = requests.post(rpc_url, json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getBalance",
-                "params": [str(from_pubkey)]
-            })
-            
-            if balance_response.status_code == 200:
-                balance_result = balance_response.json()
-                if "result" in balance_result:
-                    wallet_balance = balance_result["result"]["value"]
-                    if wallet_balance < lamport_amount:
-                        raise Exception(f"Insufficient SOL balance. Have {wallet_balance/1e9:.6f} SOL, need {lamport_amount/1e9:.6f} SOL")
-            
-            # Get recent blockhash
-            blockhash_response = requests.post(rpc_url, json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getLatestBlockhash",
-                "params": [{"commitment": "finalized"}]
-            })
-            
-            if blockhash_response.status_code != 200:
-                raise Exception(f"Failed to get blockhash: {blockhash_response.status_code}")
-            
-            blockhash_result = blockhash_response.json()
-            if "error" in blockhash_result:
-                raise Exception(f"RPC error: {blockhash_result['error']}")
-            
-            recent_blockhash = blockhash_result["result"]["value"]["blockhash"]
+            # Get a recent blockhash. The wallet balance is checked by the
+            # sendTransaction preflight simulation.
+            blockhash_result, = await self._rpc_batch(rpc_url, [
+                ("getLatestBlockhash", [{"commitment": "finalized"}]),
+            ])
+            recent_blockhash = self._parse_blockhash(blockhash_result)
             
             # Create transfer instruction (matches TypeScript SystemProgram.transfer)
             transfer_ix = transfer(
@@ -231,13 +483,11 @@ class Vault:
             
             # Build transaction the correct way for solders library
             # Create message with instruction and recent blockhash
-            message = Message.new_with_blockhash([transfer_ix], from_pubkey, Hash.from_string(recent_blockhash))
-            
-            # Create transaction from message
-            transaction = Transaction.new_unsigned(message)
+            blockhash = Hash.from_string(recent_blockhash)
+            message = Message.new_with_blockhash([transfer_ix], from_pubkey, blockhash)
             
-            # Sign transaction (matches TypeScript transaction.sign)
-            transaction.sign([self.wallet], Hash.from_string(recent_blockhash))
+            # Create and sign transaction in one step (matches TypeScript transaction.sign)
+            transaction = Transaction([self.wallet], message, blockhash)
             
             # Serialize transaction using solders library __bytes__ method
             serialized_tx = bytes(transaction)
@@ -245,7 +495,7 @@ class Vault:
             # Send transaction using base64 encoding (like TypeScript)
             encoded_tx = base64.b64encode(serialized_tx).decode('ascii')
             
-            send_response = requests.post(rpc_url, json={
+            send_response = await self._post_rpc(rpc_url, {
                 "jsonrpc": "2.0",
                 "id": 1,
                 "method": "sendTransaction",
@@ -262,103 +512,65 @@ class Vault:
             if send_response.status_code != 200:
                 raise Exception(f"Failed to send transaction: {send_response.status_code}")
             
-            send_result = send_response.json()
+            send_result = _json.loads(send_response.content)
             if "error" in send_result:
+                if _is_insufficient_funds(send_result["error"], instruction_index=0, include_fee_errors=True):
+                    raise Exception(f"Insufficient SOL balance. Need {lamport_amount / LAMPORTS_PER_SOL:.6f} SOL")
                 error_msg = send_result['error'].get('message', 'Unknown error')
                 raise Exception(f"Transaction failed: {error_msg}")
             
             signature = send_result["result"]
             
-            print(f"✅ SOL transfer successful!")
-            print(f"   Amount: {amount} SOL ({lamport_amount:,} lamports)")
-            print(f"   From: {from_pubkey}")  
-            print(f"   To: {to_pubkey}")
-            print(f"   Signature: {signature}")
-            print(f"   View: https://solscan.io/tx/{signature}")
+            logger.info(
+                "SOL transfer sent: %s SOL (%s lamports) from %s to %s, signature %s "
+                "(https://solscan.io/tx/%s)",
+                amount, lamport_amount, from_pubkey, to_pubkey, signature, signature
+            )
             
-            return signature
+            return signature, encoded_tx, recent_blockhash
             
         except Exception as e:
             raise Exception(f"SOL transfer failed: {e}")
     
-    async def _transfer_nos(self, amount: float, lamports: bool = False) -> str:
+    async def _transfer_nos(self, amount: float, lamports: bool = False, sol: float = 0.0) -> Tuple[str, str, str]:
         """Transfer NOS tokens from user wallet to vault using SPL token transfers.
         
         Matches the TypeScript SDK implementation exactly.
         
         Args:
             amount: NOS amount to transfer
-            lamports: If True, amount is in raw token units (1e6 = 1 NOS)
+            lamports: If True, amounts are in raw units (1e6 = 1 NOS, lamports for SOL)
+            sol: SOL amount to transfer to the vault in the same transaction
             
         Returns:
-            Transaction signature
+            (signature, encoded transaction, blockhash) of the sent, unconfirmed transaction
         """
+        label = "SOL and NOS" if sol > 0 else "NOS"
         try:
-            # NOS token mint address
-            NOS_MINT = "nosXBVoaCTtYdLvKY6Csb4AC8JCdQKKAaWYtx2ZMoo7"
-            SPL_TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
-            ASSOCIATED_TOKEN_PROGRAM = "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
-            SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
-            SYSVAR_RENT = "SysvarRent111111111111111111111111111111111"
-            
             # Convert to smallest units if needed (NOS has 6 decimals)
-            token_amount = int(amount) if lamports else int(amount * 1_000_000)
+            token_amount = int(amount) if lamports else round(amount * NOS_UNITS_PER_NOS)
+            lamport_amount = int(sol) if lamports else round(sol * LAMPORTS_PER_SOL)
             
             # Create public keys
-            from_pubkey = Pubkey.from_string(str(self.wallet.pubkey()))
-            to_pubkey = Pubkey.from_string(self.public_key)
-            nos_mint = Pubkey.from_string(NOS_MINT)
-            spl_token_program = Pubkey.from_string(SPL_TOKEN_PROGRAM)
-            ata_program = Pubkey.from_string(ASSOCIATED_TOKEN_PROGRAM)
-            system_program = Pubkey.from_string(SYSTEM_PROGRAM_ID)
-            rent_sysvar = Pubkey.from_string(SYSVAR_RENT)
+            from_pubkey = self._wallet_pk
+            to_pubkey = self._public_key_pk
             
             # Get associated token accounts
-            from_token_account = self._get_associated_token_account(from_pubkey, nos_mint, ata_program, spl_token_program)
-            to_token_account = self._get_associated_token_account(to_pubkey, nos_mint, ata_program, spl_token_program)
+            from_token_account = derive_ata(from_pubkey)
+            to_token_account = self._nos_ata_pk
             
             # RPC connection
             rpc_url = "https://api.mainnet-beta.solana.com"
             
-            # Check NOS balance first (source account)
-            balance_response = requests.post(rpc_url, json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTokenAccountBalance",
-                "params": [str(from_token_account)]
-            })
-            
-            if balance_response.status_code == 200:
-                balance_result = balance_response.json()
-                if "result" in balance_result and balance_result["result"]["value"]:
-                    current_balance = int(balance_result["result"]["value"]["amount"])
-                    if current_balance < token_amount:
-                        raise Exception(f"Insufficient NOS balance. Have {current_balance/1e6:.6f} NOS, need {token_amount/1e6:.6f} NOS")
-            
-            # Determine if destination ATA exists
-            dest_info = requests.post(rpc_url, json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getAccountInfo",
-                "params": [str(to_token_account), {"encoding": "base64"}]
-            })
-            dest_exists = False
-            if dest_info.status_code == 200:
-                dest_json = dest_info.json()
-                dest_exists = bool(dest_json.get("result", {}).get("value"))
-            
-            # Get recent blockhash
-            blockhash_response = requests.post(rpc_url, json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getLatestBlockhash",
-                "params": [{"commitment": "finalized"}]
-            })
-            
-            if blockhash_response.status_code != 200:
-                raise Exception("Failed to get recent blockhash")
-            
-            blockhash = blockhash_response.json()["result"]["value"]["blockhash"]
+            # Check whether the destination ATA exists and get a blockhash in a
+            # single round trip. The source NOS balance is checked by the
+            # sendTransaction preflight simulation.
+            account_result, blockhash_result = await self._rpc_batch(rpc_url, [
+                ("getAccountInfo", [self._nos_ata, {"encoding": "base64"}]),
+                ("getLatestBlockhash", [{"commitment": "finalized"}]),
+            ])
+            dest_exists = bool(account_result.get("result", {}).get("value"))
+            blockhash = self._parse_blockhash(blockhash_result)
             
             # Create SPL token transfer instruction
             transfer_instruction = self._create_spl_transfer_instruction(
@@ -366,22 +578,32 @@ class Vault:
                 to_token_account, 
                 from_pubkey,
                 token_amount,
-                spl_token_program
+                TOKEN_PROGRAM_PUBKEY
             )
             
-            # Optionally prepend create associated token account instruction if needed
             instructions = []
+            if lamport_amount > 0:
+                # SOL transfer goes first so its errors map to instruction 0
+                instructions.append(transfer(
+                    TransferParams(
+                        from_pubkey=from_pubkey,
+                        to_pubkey=to_pubkey,
+                        lamports=lamport_amount
+                    )
+                ))
+            
+            # Optionally prepend create associated token account instruction if needed
             if not dest_exists:
                 create_ata_ix = Instruction(
-                    program_id=ata_program,
+                    program_id=ASSOC_TOKEN_PROGRAM_PUBKEY,
                     accounts=[
                         AccountMeta(pubkey=from_pubkey, is_signer=True, is_writable=True),  # payer
                         AccountMeta(pubkey=to_token_account, is_signer=False, is_writable=True),  # ata
                         AccountMeta(pubkey=to_pubkey, is_signer=False, is_writable=False),  # owner
-                        AccountMeta(pubkey=nos_mint, is_signer=False, is_writable=False),  # mint
-                        AccountMeta(pubkey=system_program, is_signer=False, is_writable=False),  # system program
-                        AccountMeta(pubkey=spl_token_program, is_signer=False, is_writable=False),  # token program
-                        AccountMeta(pubkey=rent_sysvar, is_signer=False, is_writable=False),  # rent sysvar
+                        AccountMeta(pubkey=NOS_MINT_PUBKEY, is_signer=False, is_writable=False),  # mint
+                        AccountMeta(pubkey=SYSTEM_PROGRAM_PUBKEY, is_signer=False, is_writable=False),  # system program
+                        AccountMeta(pubkey=TOKEN_PROGRAM_PUBKEY, is_signer=False, is_writable=False),  # token program
+                        AccountMeta(pubkey=SYSVAR_RENT_PUBKEY, is_signer=False, is_writable=False),  # rent sysvar
                     ],
                     data=bytes()
                 )
@@ -400,11 +622,10 @@ class Vault:
             transaction = VersionedTransaction(message, [self.wallet])
             
             # Send transaction
-            import base64
             transaction_bytes = bytes(transaction)
             encoded_tx = base64.b64encode(transaction_bytes).decode('ascii')
             
-            send_response = requests.post(rpc_url, json={
+            send_response = await self._post_rpc(rpc_url, {
                 "jsonrpc": "2.0",
                 "id": 1,
                 "method": "sendTransaction",
@@ -422,40 +643,34 @@ class Vault:
             if send_response.status_code != 200:
                 raise Exception(f"Transaction failed: {send_response.text}")
             
-            send_result = send_response.json()
+            send_result = _json.loads(send_response.content)
             if "error" in send_result:
+                if lamport_amount > 0 and _is_insufficient_funds(send_result["error"], instruction_index=0, include_fee_errors=True):
+                    raise Exception(f"Insufficient SOL balance. Need {lamport_amount / LAMPORTS_PER_SOL:.6f} SOL")
+                if _is_insufficient_funds(send_result["error"], instruction_index=len(instructions) - 1):
+                    raise Exception(f"Insufficient NOS balance. Need {token_amount / NOS_UNITS_PER_NOS:.6f} NOS")
                 raise Exception(f"Transaction error: {send_result['error']}")
             
             signature = send_result.get("result")
             if not signature:
                 raise Exception("No transaction signature returned")
             
-            print(f"✅ NOS transfer successful!")
-            print(f"   Amount: {amount} NOS ({token_amount:,} units)")
-            print(f"   From: {from_pubkey}")  
-            print(f"   To: {to_pubkey}")
-            print(f"   Signature: {signature}")
-            print(f"   View: https://solscan.io/tx/{signature}")
+            logger.info(
+                "%s transfer sent: %s NOS (%s units) and %s lamports from %s to %s, signature %s "
+                "(https://solscan.io/tx/%s)",
+                label, amount, token_amount, lamport_amount, from_pubkey, to_pubkey, signature, signature
+            )
             
-            return signature
+            return signature, encoded_tx, blockhash
             
         except Exception as e:
-            raise Exception(f"NOS transfer failed: {e}")
-    
-    def _get_associated_token_account(self, owner: Pubkey, mint: Pubkey, ata_program: Pubkey, token_program: Pubkey) -> Pubkey:
-        """Get associated token account address for a given owner and mint."""
-        # Find PDA for associated token account
-        seeds = [bytes(owner), bytes(token_program), bytes(mint)]
-        ata_address, _ = Pubkey.find_program_address(seeds, ata_program)
-        return ata_address
+            raise Exception(f"{label} transfer failed: {e}")
     
     def _create_spl_transfer_instruction(self, source: Pubkey, destination: Pubkey, owner: Pubkey, amount: int, token_program: Pubkey):
         """Create SPL token transfer instruction."""
-        from solders.instruction import Instruction, AccountMeta
-        
         # SPL Token Transfer instruction data
         # Instruction: 3 (Transfer) + amount (8 bytes little endian)
-        instruction_data = bytes([3]) + amount.to_bytes(8, 'little')
+        instruction_data = _SPL_TRANSFER_DATA.pack(SPL_TRANSFER_INSTRUCTION, amount)
         
         return Instruction(
             program_id=token_program,
@@ -474,20 +689,22 @@ class Vault:
         
         Returns:
             Transaction signature
+            
+        Raises:
+            TimeoutError: If the transaction is not confirmed within CONFIRM_TIMEOUT
         """
         try:
             # Use the deployment manager withdraw endpoint
             # Send empty body to withdraw all funds
-            response = self.client._request("POST", f"/api/vault/{self.public_key}/withdraw", json={})
+            response = await asyncio.to_thread(
+                self.client._request, "POST", f"/api/vault/{self.public_key}/withdraw", json={}
+            )
             
             transaction_b64 = response.get("transaction")
             if not transaction_b64:
                 raise Exception("No transaction returned from withdraw API")
             
             # Deserialize the transaction (matches TypeScript SDK implementation)
-            import base64
-            from solders.transaction import VersionedTransaction
-            
             # Decode base64 transaction
             transaction_bytes = base64.b64decode(transaction_b64)
             
@@ -497,7 +714,7 @@ class Vault:
             # Sign only our required signature while preserving others from the server
             message = transaction.message
             signer_pubkeys = list(message.signer_keys())
-            user_pubkey = Pubkey.from_string(str(self.wallet.pubkey()))
+            user_pubkey = self._wallet_pk
             try:
                 signer_index = signer_pubkeys.index(user_pubkey)
             except ValueError:
@@ -519,8 +736,7 @@ class Vault:
             encoded_tx = base64.b64encode(signed_transaction_bytes).decode('ascii')
             
             # Send transaction
-            import requests
-            send_response = requests.post(rpc_url, json={
+            send_response = await self._post_rpc(rpc_url, {
                 "jsonrpc": "2.0",
                 "id": 1,
                 "method": "sendTransaction",
@@ -537,33 +753,30 @@ class Vault:
             if send_response.status_code != 200:
                 raise Exception(f"Failed to send withdrawal transaction: {send_response.status_code}")
             
-            send_result = send_response.json()
+            send_result = _json.loads(send_response.content)
             if "error" in send_result:
                 error_msg = send_result['error'].get('message', 'Unknown error')
                 raise Exception(f"Withdrawal transaction failed: {error_msg}")
             
             signature = send_result["result"]
             
-            # Wait for confirmation (like TypeScript SDK)
-            import asyncio
-            await asyncio.sleep(5)
+            # Wait for confirmation, rebroadcasting until the transaction lands
+            await self._confirm_transactions(rpc_url, [(signature, encoded_tx, str(message.recent_blockhash))])
             
-            # Get confirmation
-            confirm_response = requests.post(rpc_url, json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getSignatureStatus",
-                "params": [signature]
-            })
-            
-            print(f"✅ Withdrawal transaction sent!")
-            print(f"📋 Signature: {signature}")
-            print(f"🔗 View: https://solscan.io/tx/{signature}")
+            logger.info(
+                "Withdrawal from vault %s confirmed, signature %s (https://solscan.io/tx/%s)",
+                self.public_key, signature, signature
+            )
             
             return signature
             
+        except TimeoutError:
+            # Not a failure: the transaction was sent and may still land
+            raise
         except Exception as e:
             raise Exception(f"Withdraw failed: {e}")
+        finally:
+            self.client._balance_cache.pop(self.public_key, None)
 
 
 def create_vault(public_key: str, wallet: Keypair, client) -> Vault:
@@ -0,0 +1,88 @@
+"""Tests for conditional deployment reads in DeploymentsClient."""
+
+import httpx
+import pytest
+from solders.keypair import Keypair
+
+from nosana_deployments.client import DeploymentsClient
+
+DEPLOYMENT = {
+    "id": "dep1",
+    "name": "test",
+    "market": "market",
+    "owner": "owner",
+    "timeout": 60,
+    "replicas": 1,
+    "status": "DRAFT",
+    "ipfs_definition_hash": "Qm",
+    "updated_at": "2026-01-01T00:00:00Z",
+    "created_at": "2026-01-01T00:00:00Z",
+    "vault": "vault",
+    "strategy": "SIMPLE",
+}
+
+
+class FakeApi:
+    """Deployment endpoint that honours If-None-Match with the status as ETag."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = []
+
+    def handler(self, request):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        self.requests.append(request)
+        etag = f'"{status}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, json={**DEPLOYMENT, "status": status}, headers={"ETag": etag})
+
+
+@pytest.fixture
+def make_client():
+    def make(api):
+        client = DeploymentsClient("http://manager.test", Keypair())
+        client._client = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(api.handler))
+        return client
+
+    return make
+
+
+def test_get_status_polls_conditionally(make_client):
+    api = FakeApi(["DRAFT", "DRAFT", "STARTING", "STARTING"])
+    client = make_client(api)
+
+    assert [client.get_status("dep1") for _ in range(4)] == ["DRAFT", "DRAFT", "STARTING", "STARTING"]
+    assert [r.headers.get("if-none-match") for r in api.requests] == [None, '"DRAFT"', '"DRAFT"', '"STARTING"']
+
+
+def test_get_status_reuses_etag_from_get(make_client):
+    api = FakeApi(["DRAFT"])
+    client = make_client(api)
+
+    assert client.get("dep1").status == "DRAFT"
+    assert client.get_status("dep1") == "DRAFT"
+    assert api.requests[-1].headers.get("if-none-match") == '"DRAFT"'
+
+
+def test_wait_for_status_reports_changes(make_client, monkeypatch):
+    monkeypatch.setattr("nosana_deployments.client.WAIT_BACKOFF_BASE", 0)
+    api = FakeApi(["DRAFT", "STARTING", "STARTING", "RUNNING"])
+    client = make_client(api)
+    seen = []
+
+    deployment = client.wait_for_status("dep1", on_change=seen.append)
+
+    assert deployment.status == "RUNNING"
+    assert seen == ["DRAFT", "STARTING", "RUNNING"]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_status_async_times_out(make_client, monkeypatch):
+    monkeypatch.setattr("nosana_deployments.client.WAIT_BACKOFF_BASE", 0.01)
+    client = make_client(FakeApi(["DRAFT"]))
+    seen = []
+
+    with pytest.raises(TimeoutError, match="still DRAFT"):
+        await client.wait_for_status_async("dep1", timeout=0.05, on_change=seen.append)
+    assert seen == ["DRAFT"]
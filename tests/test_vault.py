@@ -0,0 +1,179 @@
+"""Tests for vault RPC error handling, retries and transaction confirmation."""
+
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from solders.keypair import Keypair
+
+from nosana_deployments import vault
+from nosana_deployments.vault import Vault, _is_insufficient_funds, _post_rpc
+
+RPC_URL = "https://rpc.test"
+BLOCKHASH = "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N"
+
+
+def send_error(err):
+    """sendTransaction preflight failure carrying ``err`` as its transaction error."""
+    return {"code": -32002, "message": "Transaction simulation failed", "data": {"err": err}}
+
+
+class FakeRpc:
+    """Solana JSON-RPC endpoint served through httpx.MockTransport."""
+
+    def __init__(self, send_result=None, statuses=None, blockhash_valid=True):
+        self.send_result = send_result or {"result": "SIG"}
+        self.statuses = statuses or [{"confirmationStatus": "confirmed", "err": None}]
+        self.blockhash_valid = blockhash_valid
+        self.methods = []
+
+    def answer(self, call):
+        method = call["method"]
+        self.methods.append(method)
+        if method == "getLatestBlockhash":
+            result = {"result": {"value": {"blockhash": BLOCKHASH, "lastValidBlockHeight": 100}}}
+        elif method == "getAccountInfo":
+            result = {"result": {"value": None}}
+        elif method == "sendTransaction":
+            result = self.send_result
+        elif method == "getSignatureStatuses":
+            # Later polls keep returning the last status
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+            result = {"result": {"value": [status] * len(call["params"][0])}}
+        elif method == "isBlockhashValid":
+            result = {"result": {"value": self.blockhash_valid}}
+        else:
+            raise AssertionError(f"unexpected RPC method {method}")
+        return {"jsonrpc": "2.0", "id": call["id"], **result}
+
+    def handler(self, request):
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            return httpx.Response(200, json=[self.answer(call) for call in body])
+        return httpx.Response(200, json=self.answer(body))
+
+
+def make_vault(rpc):
+    client = SimpleNamespace(
+        _rpc_client=httpx.AsyncClient(transport=httpx.MockTransport(rpc.handler)),
+        _balance_cache={},
+    )
+    return Vault(str(Keypair().pubkey()), Keypair(), client)
+
+
+@pytest.fixture(autouse=True)
+def fast_confirm(monkeypatch):
+    monkeypatch.setattr(vault, "CONFIRM_POLL_INTERVAL", 0)
+    monkeypatch.setattr(vault, "RPC_BACKOFF_BASE", 0)
+
+
+@pytest.mark.parametrize(
+    ("err", "expected"),
+    [
+        ({"InstructionError": [0, {"Custom": 1}]}, True),
+        ({"InstructionError": [1, {"Custom": 1}]}, False),
+        ({"InstructionError": [0, {"Custom": 0}]}, False),
+        ("InsufficientFundsForFee", True),
+        ({"InsufficientFundsForRent": {"account_index": 0}}, True),
+        ({"InsufficientFundsForRent": {"account_index": 1}}, False),
+    ],
+)
+def test_is_insufficient_funds(err, expected):
+    assert _is_insufficient_funds(send_error(err), instruction_index=0, include_fee_errors=True) is expected
+
+
+def test_fee_errors_ignored_unless_requested():
+    assert not _is_insufficient_funds(send_error("InsufficientFundsForFee"), instruction_index=0)
+    assert not _is_insufficient_funds(send_error({"InsufficientFundsForRent": {"account_index": 0}}), instruction_index=0)
+
+
+@pytest.mark.asyncio
+async def test_post_rpc_retries_server_errors():
+    responses = [httpx.Response(503), httpx.Response(429), httpx.Response(200, json={"result": 1})]
+    transport = httpx.MockTransport(lambda request: responses.pop(0))
+    async with httpx.AsyncClient(transport=transport) as rpc_client:
+        response = await _post_rpc(rpc_client, RPC_URL, {"method": "getHealth"})
+    assert response.status_code == 200
+    assert not responses
+
+
+@pytest.mark.asyncio
+async def test_post_rpc_gives_up_after_max_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as rpc_client:
+        response = await _post_rpc(rpc_client, RPC_URL, {"method": "getHealth"})
+    assert response.status_code == 503
+    assert len(calls) == vault.RPC_MAX_RETRIES + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("kwargs", "err", "message"),
+    [
+        ({"sol": 0.01}, {"InstructionError": [0, {"Custom": 1}]}, "Insufficient SOL balance"),
+        ({"sol": 0.01}, "InsufficientFundsForFee", "Insufficient SOL balance"),
+        ({"sol": 0.0001}, {"InsufficientFundsForRent": {"account_index": 1}}, "Transaction failed"),
+        ({"nos": 3.0}, {"InstructionError": [1, {"Custom": 1}]}, "Insufficient NOS balance"),
+        ({"sol": 0.01, "nos": 3.0}, {"InstructionError": [0, {"Custom": 1}]}, "Insufficient SOL balance"),
+        ({"sol": 0.01, "nos": 3.0}, {"InstructionError": [2, {"Custom": 1}]}, "Insufficient NOS balance"),
+        ({"nos": 3.0}, {"InsufficientFundsForRent": {"account_index": 1}}, "Transaction error"),
+    ],
+)
+async def test_topup_attributes_send_errors(kwargs, err, message):
+    rpc = FakeRpc(send_result={"error": send_error(err)})
+    with pytest.raises(Exception, match=message):
+        await make_vault(rpc).topup(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_topup_returns_once_confirmed():
+    rpc = FakeRpc(statuses=[None, {"confirmationStatus": "processed", "err": None},
+                            {"confirmationStatus": "confirmed", "err": None}])
+    assert await make_vault(rpc).topup(sol=0.01, nos=3.0) == "SIG"
+    assert rpc.methods.count("sendTransaction") == 1
+    assert rpc.methods.count("getSignatureStatuses") == 3
+
+
+@pytest.mark.asyncio
+async def test_confirm_raises_on_failed_transaction():
+    rpc = FakeRpc(statuses=[{"confirmationStatus": "confirmed", "err": {"InstructionError": [0, "x"]}}])
+    with pytest.raises(Exception, match="Transaction SIG failed"):
+        await make_vault(rpc).topup(sol=0.01)
+
+
+@pytest.mark.asyncio
+async def test_confirm_raises_on_expired_blockhash():
+    rpc = FakeRpc(statuses=[None], blockhash_valid=False)
+    with pytest.raises(Exception, match="expired before it was confirmed"):
+        await make_vault(rpc).topup(sol=0.01)
+
+
+@pytest.mark.asyncio
+async def test_confirm_times_out(monkeypatch):
+    monkeypatch.setattr(vault, "CONFIRM_TIMEOUT", 0.05)
+    rpc = FakeRpc(statuses=[None])
+    with pytest.raises(TimeoutError, match="SIG"):
+        await make_vault(rpc).topup(sol=0.01)
+
+
+@pytest.mark.asyncio
+async def test_get_balance_fresh_skips_cache():
+    requests = []
+
+    def request(method, path):
+        requests.append(path)
+        return {"sol": len(requests), "nos": 0}
+
+    client = SimpleNamespace(_request=request, _balance_cache={})
+    v = Vault(str(Keypair().pubkey()), Keypair(), client)
+
+    assert (await v.get_balance())["SOL"] == 1
+    assert (await v.get_balance())["SOL"] == 1
+    assert (await v.get_balance(fresh=True))["SOL"] == 2
+    assert len(requests) == 2